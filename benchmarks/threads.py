@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: threads.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+"""Benchmarks building command strings from a thread pool.
+
+Compares building with the shared schema cache against parsing the command
+JSON and encoding the parameters on each call without touching the cache,
+for an increasing number of threads. Run it with both a
+standard and a free-threaded (``python3.13t``) interpreter to compare the
+scaling. Usage: ``python benchmarks/threads.py [n_calls] [max_threads]``.
+
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+
+from unclick import build_command_string, command_to_json, schema_cache
+from unclick.core import _encode_params, _join_fragments
+
+
+N_COMMANDS = 100
+
+
+def make_command(name: str):
+    @click.command(name=name)
+    @click.argument("POSITION", type=float)
+    @click.option("--axis", type=click.Choice(["x", "y", "z"]), default="x")
+    @click.option("--speed", type=int, default=1)
+    @click.option("--relative/--absolute", default=False)
+    def command(**kwargs):
+        return
+
+    return command
+
+
+def run(command_infos: list, n_calls: int, n_threads: int, use_cache: bool):
+    """Builds ``n_calls`` command strings and returns the calls per second."""
+
+    def worker(start: int):
+        for ii in range(start, n_calls, n_threads):
+            command_info = command_infos[ii % len(command_infos)]
+            kwargs = {"axis": "y", "speed": ii}
+            if use_cache:
+                build_command_string(command_info, 1.5, **kwargs)
+            else:
+                # Same work as build_command_string() but bypassing the cache.
+                info_dict = json.loads(command_info)
+                fragments = _encode_params(info_dict, (1.5,), kwargs)
+                _join_fragments(info_dict, fragments)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        list(executor.map(worker, range(n_threads)))
+
+    return n_calls / (time.perf_counter() - t0)
+
+
+def main():
+    n_calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    max_threads = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL enabled: {is_gil_enabled}, ", end="")
+    print(f"CPUs: {os.cpu_count()}")
+
+    commands = [make_command(f"cmd{ii}") for ii in range(N_COMMANDS)]
+    command_infos = [command_to_json(command) for command in commands]
+
+    # Make sure the cache can hold all the commands.
+    schema_cache.maxsize = max(schema_cache.maxsize, N_COMMANDS)
+
+    print(f"{'threads':>8} {'no cache (calls/s)':>20} {'cache (calls/s)':>17}")
+
+    n_threads = 1
+    while n_threads <= max_threads:
+        no_cache = run(command_infos, n_calls, n_threads, False)
+        cache = run(command_infos, n_calls, n_threads, True)
+        print(f"{n_threads:>8} {no_cache:>20,.0f} {cache:>17,.0f}")
+        n_threads *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -6,4 +6,7 @@
 # @Filename: __init__.py
 # @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
 
+from .completion import *
 from .core import *
+from .logs import *
+from .static import *
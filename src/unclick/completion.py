@@ -0,0 +1,423 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: completion.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+from __future__ import annotations
+
+import shlex
+
+import typing as t
+
+import click
+
+from .core import schema_cache
+
+
+__all__ = ["CommandIndex"]
+
+
+class _TrieNode:
+    """A node in a `._PrefixTrie`."""
+
+    __slots__ = ("children", "key", "value", "items")
+
+    def __init__(self):
+        self.children: dict[str, _TrieNode] = {}
+        self.key: str | None = None
+        self.value: t.Any = None
+
+        # Sorted key-value pairs under this node, created when first needed.
+        self.items: list[tuple[str, t.Any]] | None = None
+
+
+class _PrefixTrie:
+    """A character trie mapping strings to values."""
+
+    def __init__(self):
+        self.root = _TrieNode()
+
+    def insert(self, key: str, value: t.Any):
+        """Adds a key to the trie. Overrides the value if the key exists."""
+
+        node = self.root
+        node.items = None
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+            node.items = None
+
+        node.key = key
+        node.value = value
+
+    def items(self, prefix: str = ""):
+        """Returns the sorted key-value pairs whose key starts with ``prefix``.
+
+        The pairs under each node are collected once and reused until a new
+        key is inserted under that node.
+
+        """
+
+        node = self.root
+        for char in prefix:
+            if char not in node.children:
+                return []
+            node = node.children[char]
+
+        if node.items is None:
+            # A depth-first traversal visiting the children in order returns
+            # the keys already sorted.
+            items = []
+            stack = [node]
+            while len(stack) > 0:
+                child = stack.pop()
+                if child.key is not None:
+                    items.append((child.key, child.value))
+                stack.extend(
+                    child.children[char]
+                    for char in sorted(child.children, reverse=True)
+                )
+            node.items = items
+
+        return list(node.items)
+
+
+class _CommandData:
+    """Parameter indices for a command.
+
+    ``path`` is the path of the command in the index, ``parent`` the data of
+    its group, if the group is in the index, and ``group_path`` the path of
+    the group (an empty string for subcommands added without the group name).
+    ``chained`` indicates whether the group is a chained group.
+
+    """
+
+    def __init__(
+        self,
+        info_dict: dict[str, t.Any],
+        path: str,
+        parent: _CommandData | None = None,
+        group_path: str | None = None,
+        chained: bool = False,
+    ):
+        self.info_dict = info_dict
+
+        self.path = path
+        self.parent = parent
+        self.group_path = group_path
+        self.chained = chained
+
+        self.is_group = "commands" in info_dict
+
+        # Click parses groups and chained subcommands without interspersed
+        # arguments, and the remaining tokens are passed to the next command.
+        self.interspersed = not (self.is_group or chained)
+
+        self.options: dict[str, dict[str, t.Any]] = {}
+        self.options_trie = _PrefixTrie()
+        self.arguments: list[dict[str, t.Any]] = []
+        self.choices: dict[str, _PrefixTrie] = {}
+
+        for param_info in info_dict["params"]:
+            if param_info["param_type_name"] == "argument":
+                self.arguments.append(param_info)
+            else:
+                for opt in param_info["opts"] + param_info.get("secondary_opts", []):
+                    self.options[opt] = param_info
+                    self.options_trie.insert(opt, param_info)
+
+            type_info = param_info["type"]
+            if type_info["param_type"].lower() == "choice":
+                choices = _PrefixTrie()
+                for choice in type_info["choices"]:
+                    choices.insert(str(choice), choice)
+                self.choices[param_info["name"]] = choices
+
+    def scan(self, tokens: list[str]):
+        """Finds the parameters set in a list of tokens.
+
+        Returns the names of the parameters that have been set, the option
+        waiting for a value if the last token is an option that takes values,
+        the next argument that will receive a value, if any, and the number of
+        tokens that belong to the command. Tokens that start with a dash are
+        considered options even if they are not known. If the command does not
+        allow interspersed arguments, options are only recognised before the
+        first argument and the scan stops at the first token left once all the
+        arguments have values.
+
+        """
+
+        set_names: set[str] = set()
+
+        iarg = 0
+        arg_values = 0
+        parse_options = True
+
+        ii = 0
+        while ii < len(tokens):
+            token = tokens[ii]
+
+            if parse_options and token == "--":
+                parse_options = False
+                ii += 1
+                continue
+
+            opt = token.split("=", 1)[0] if token.startswith("-") else token
+            is_option = opt in self.options or (len(opt) > 1 and opt[0] == "-")
+            if parse_options and is_option:
+                ii += 1
+
+                if opt not in self.options:
+                    continue
+
+                param_info = self.options[opt]
+                set_names.add(param_info["name"])
+
+                takes_value = not param_info.get("is_flag", False)
+                takes_value = takes_value and not param_info.get("count", False)
+                if takes_value and opt == token:
+                    if ii + param_info["nargs"] > len(tokens):
+                        return set_names, param_info, None, len(tokens)
+                    ii += param_info["nargs"]
+
+                continue
+
+            if iarg >= len(self.arguments):
+                if not self.interspersed:
+                    break
+                ii += 1
+                continue
+
+            ii += 1
+            if not self.interspersed:
+                parse_options = False
+
+            argument = self.arguments[iarg]
+            set_names.add(argument["name"])
+
+            arg_values += 1
+            if argument["nargs"] != -1 and arg_values >= argument["nargs"]:
+                iarg += 1
+                arg_values = 0
+
+        next_argument = self.arguments[iarg] if iarg < len(self.arguments) else None
+
+        return set_names, None, next_argument, ii
+
+
+def _split_line(line: str):
+    """Splits a partial command line into the complete tokens and the last one."""
+
+    try:
+        tokens = shlex.split(line)
+    except ValueError:
+        # Unclosed quotes.
+        try:
+            tokens = shlex.split(line + '"')
+        except ValueError:
+            tokens = line.split()
+
+    if line == "" or line[-1].isspace() or len(tokens) == 0:
+        return tokens, ""
+
+    return tokens[:-1], tokens[-1]
+
+
+class CommandIndex:
+    """An index of commands for completing partial command lines.
+
+    Command paths (including the subcommands of groups), option names, and
+    choice values are stored in prefix tries so that completions do not
+    require scanning the parameters of every command. ``commands`` is a list
+    of commands to add to the index (see `.add`).
+
+    """
+
+    def __init__(self, commands: t.Iterable[dict | str | click.Command] = ()):
+        self._commands: dict[str, _CommandData] = {}
+        self._commands_trie = _PrefixTrie()
+
+        for command_info in commands:
+            self.add(command_info)
+
+    def __len__(self):
+        return len(self._commands)
+
+    def add(self, command_info: dict | str | click.Command, name: str | None = None):
+        """Adds a command to the index.
+
+        If the command is a group its subcommands are also added, with paths
+        in the form ``"group subcommand"``. ``name`` replaces the name of the
+        command in the paths. An empty ``name`` can be used to add only the
+        subcommands of a group, without the group name.
+
+        """
+
+        info_dict = schema_cache.get(command_info)
+        self._add_info(info_dict, info_dict["name"] if name is None else name)
+
+    def _add_info(
+        self,
+        info_dict: dict[str, t.Any],
+        path: str,
+        parent: _CommandData | None = None,
+        group_path: str | None = None,
+        chained: bool = False,
+    ):
+        """Adds the command information for a command path."""
+
+        data = None
+        if path != "":
+            data = _CommandData(info_dict, path, parent, group_path, chained)
+            self._commands[path] = data
+            self._commands_trie.insert(path, data)
+
+        for subcommand_name, subcommand_info in info_dict.get("commands", {}).items():
+            subcommand_path = f"{path} {subcommand_name}".strip()
+            self._add_info(
+                subcommand_info,
+                subcommand_path,
+                parent=data,
+                group_path=path,
+                chained=info_dict.get("chain", False),
+            )
+
+    def find_commands(self, prefix: str = ""):
+        """Returns the sorted paths of the commands that start with ``prefix``."""
+
+        return [path for path, _ in self._commands_trie.items(prefix)]
+
+    def _find_subcommands(self, group_path: str, prefix: str = ""):
+        """Returns the names of the subcommands of a group starting with ``prefix``."""
+
+        names: list[str] = []
+        for path, data in self._commands_trie.items(f"{group_path} {prefix}".lstrip()):
+            if data.group_path == group_path:
+                names.append(path[len(group_path) :].strip())
+
+        return names
+
+    def _resolve(self, tokens: list[str]):
+        """Finds the command that receives the last tokens of a command line.
+
+        The top-level command is the longest path at the beginning of the
+        tokens. The parameters of groups and chained subcommands are then
+        skipped, in the same way as click parses them, to find the subcommands
+        that follow. Returns the command data and the index of the first token
+        after the command name, or `None` if no command matches.
+
+        """
+
+        data: _CommandData | None = None
+        start = 0
+
+        for ntokens in range(len(tokens), 0, -1):
+            path = " ".join(tokens[:ntokens])
+            if path in self._commands and self._commands[path].parent is None:
+                data = self._commands[path]
+                start = ntokens
+                break
+
+        while data is not None and not data.interspersed:
+            *_, ntokens = data.scan(tokens[start:])
+            if start + ntokens >= len(tokens):
+                break
+
+            group_path = data.path if data.is_group else data.group_path
+            path = f"{group_path} {tokens[start + ntokens]}".lstrip()
+            if path not in self._commands:
+                break
+
+            data = self._commands[path]
+            start += ntokens + 1
+
+        return data, start
+
+    def complete(self, line: str):
+        """Returns the possible completions for the last token in a command line.
+
+        If the command has not been fully typed, returns the names of the
+        possible commands or subcommands. After the command, completes the
+        option names if the token starts with a dash, and choice values for
+        options and arguments. Options that have already been used are not
+        suggested unless they can be repeated. Once all the arguments of a
+        group or of a subcommand of a chained group have values, the names of
+        the next subcommands are also suggested.
+
+        """
+
+        tokens, current = _split_line(line)
+        data, start = self._resolve(tokens)
+
+        if data is None:
+            prefix = " ".join(tokens + [current])
+            ntokens = len(tokens)
+
+            command_tokens = (
+                command_path.split(" ")[ntokens]
+                for command_path in self.find_commands(prefix)
+            )
+
+            return list(dict.fromkeys(command_tokens))
+
+        rest = tokens[start:]
+        set_names, pending_option, next_argument, ntokens = data.scan(rest)
+
+        if ntokens < len(rest):
+            # Unknown tokens after the arguments of a group or chained command.
+            return []
+
+        if pending_option is not None:
+            choices = data.choices.get(pending_option["name"], None)
+            return [key for key, _ in choices.items(current)] if choices else []
+
+        if current.startswith("-"):
+            return [
+                opt
+                for opt, param_info in data.options_trie.items(current)
+                if param_info["name"] not in set_names
+                or param_info.get("multiple", False)
+                or param_info.get("count", False)
+            ]
+
+        if next_argument is not None:
+            if next_argument["name"] in data.choices:
+                choices = data.choices[next_argument["name"]]
+                return [key for key, _ in choices.items(current)]
+            return []
+
+        if data.is_group:
+            return self._find_subcommands(data.path, current)
+        elif data.chained:
+            return self._find_subcommands(t.cast(str, data.group_path), current)
+
+        return []
+
+    def unset_params(self, line: str):
+        """Returns the names of the parameters not yet set in a command line.
+
+        The help option is not included. Raises a `ValueError` if the command
+        line does not start with a known command.
+
+        """
+
+        tokens, current = _split_line(line)
+        if current != "":
+            tokens.append(current)
+
+        data, start = self._resolve(tokens)
+        if data is None:
+            raise ValueError(f"Command line {line!r} does not match any command.")
+
+        set_names, *_ = data.scan(tokens[start:])
+
+        unset: list[str] = []
+        for param_info in data.info_dict["params"]:
+            name = param_info["name"]
+            if name == "help" or name in set_names or name in unset:
+                continue
+            unset.append(name)
+
+        return unset
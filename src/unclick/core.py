@@ -10,6 +10,9 @@ from __future__ import annotations
 
 import inspect
 import json
+import shlex
+import threading
+import types
 
 import typing as t
 
@@ -20,11 +23,24 @@ import makefun
 __all__ = [
     "command_to_json",
     "build_command_string",
+    "bind",
+    "build_chain_string",
+    "build_batch_string",
+    "parse_command_string",
+    "verify_command_string",
     "create_signature",
     "create_function",
+    "SchemaCache",
+    "schema_cache",
 ]
 
 
+try:
+    from click.parser import _OptionParser as OptionParser  # click>=8.2
+except ImportError:  # pragma: no cover
+    from click.parser import OptionParser
+
+
 def command_to_json(command: click.Command) -> str:
     """Generates a JSON representation of a click command."""
 
@@ -50,16 +66,6 @@ def _add_extra_info(command_info: dict):
     return command_info_copy
 
 
-def _get_param_info(command_info: dict, param_name: str):
-    """Returns the data for a parameter."""
-
-    for info in command_info["params"]:
-        if info["name"] == param_name:
-            return info
-
-    raise ValueError("Parameter not found.")
-
-
 def _check_type(value: t.Any, param_info: dict[str, t.Any]):
     """Checks that a value has the correct type for a parameter."""
 
@@ -190,6 +196,10 @@ def parse_value(value: t.Any, param_info: dict[str, t.Any]):
         value_str = " ".join(map(str, value))
 
     else:
+        # Use a copy so that the parameter information is not modified.
+        param_info = param_info.copy()
+        param_info["type"] = param_info["type"].copy()
+
         if value is True or value is False:
             param_info["type"]["param_type"] = "bool"
             return parse_value(value, param_info)
@@ -229,77 +239,113 @@ def build_command_string(command_info: dict | str | click.Command, *args, **kwar
     ``kwargs`` must match the names of the click options as defined in the
     information JSON.
 
+    If ``verify=True`` is passed, the resulting string is parsed back with
+    click's option parser and checked against the input values using
+    `.verify_command_string`. If the command has a parameter called
+    ``verify``, the keyword argument is used as the value for that parameter
+    instead.
+
     """
 
-    if isinstance(command_info, click.Command):
-        command_info = command_to_json(command_info)
+    info_dict = schema_cache.get(command_info)
+    verify = _pop_verify(info_dict, kwargs)
 
-    info_dict: dict[str, t.Any]
+    fragments = _encode_params(info_dict, args, kwargs)
+    command_string = _join_fragments(info_dict, fragments)
 
-    if isinstance(command_info, str):
-        info_dict = json.loads(command_info)
-    else:
-        info_dict = command_info
+    if verify:
+        verify_command_string(command_info, command_string, *args, **kwargs)
 
-    command_string_template = "{command_name}{options}{arguments}"
+    return command_string
 
-    # Add required and arguments sections.
-    info_dict = _add_extra_info(info_dict)
 
-    # First assign positional arguments to click command arguments.
-    arguments = []
+def _pop_verify(info_dict: dict[str, t.Any], kwargs: dict[str, t.Any]):
+    """Removes and returns the ``verify`` keyword argument.
 
-    kwargs_consumed = []
+    If the command has a parameter called ``verify``, the keyword argument is
+    left in ``kwargs`` and `False` is returned.
 
-    n_arguments = len(info_dict["arguments"])
+    """
 
-    args_required = []
-    for arg in info_dict["arguments"]:
-        param_info = _get_param_info(info_dict, arg)
-        if param_info is None or not param_info["required"]:
-            continue
-        args_required.append(param_info["name"])
+    for param_info in info_dict["params"]:
+        if param_info["name"] == "verify":
+            return False
 
-    if n_arguments < len(args):
+    return bool(kwargs.pop("verify", False))
+
+
+def _encode_params(
+    info_dict: dict[str, t.Any],
+    args: tuple,
+    kwargs: dict[str, t.Any],
+    arg_offset: int = 0,
+    bound: t.Collection[int] = (),
+    partial: bool = False,
+):
+    """Validates and encodes the values of the command parameters.
+
+    Returns a mapping of the index of each parameter in ``info_dict["params"]``
+    to its encoded string. ``arg_offset`` is the number of arguments already
+    assigned positionally, and ``bound`` the indices of the parameters that have
+    already been encoded. If ``partial=True``, missing required parameters do
+    not raise an error.
+
+    """
+
+    params = info_dict["params"]
+
+    fragments: dict[int, str] = {}
+    kwargs_consumed = []
+
+    arg_indices = [
+        iparam
+        for iparam, param_info in enumerate(params)
+        if param_info["param_type_name"] == "argument"
+    ]
+    arg_names = [params[iparam]["name"] for iparam in arg_indices]
+
+    if len(arg_indices) < arg_offset + len(args):
         raise ValueError("More arguments provided than expected.")
 
-    if n_arguments > 0:
-        for iarg in range(n_arguments):
-            arg_name = info_dict["arguments"][iarg]
+    # First assign positional arguments to click command arguments.
+    for iarg, iparam in enumerate(arg_indices):
+        param_info = params[iparam]
+        arg_name = param_info["name"]
 
-            # First check if we have not exhausted the positional arguments:
-            if iarg <= len(args) - 1:
-                value = args[iarg]
+        if iarg < arg_offset:
+            # Already assigned.
+            continue
+
+        # First check if we have not exhausted the positional arguments:
+        if iarg - arg_offset < len(args):
+            value = args[iarg - arg_offset]
+        else:
+            # If the we have run out of positional arguments check if the argument
+            # has been passed in as a keyword argument.
+            if arg_name in kwargs:
+                value = kwargs[arg_name]
+                kwargs_consumed.append(arg_name)
+            elif param_info["required"] and not (partial or iparam in bound):
+                raise ValueError(f"Missing value for argument {arg_name!r}.")
             else:
-                # If the we have run out of positional arguments check if the argument
-                # has been passed in as a keyword argument.
-                if arg_name in kwargs:
-                    value = kwargs[arg_name]
-                    kwargs_consumed.append(arg_name)
-                else:
-                    if arg_name in args_required:
-                        raise ValueError(f"Missing value for argument {arg_name!r}.")
-                    else:
-                        continue
-
-            param_info = _get_param_info(info_dict, arg_name)
-            _check_type(value, param_info)
-            arguments.append(parse_value(value, param_info))
-
-    # Now let's move to the options. Loop over the keyword arguments and build the
-    # options string.
+                continue
 
-    options = []
+        _check_type(value, param_info)
+        fragments[iparam] = parse_value(value, param_info)
 
-    for param_info in info_dict["params"]:
+    # Now let's move to the options. Loop over the keyword arguments and encode
+    # each option.
+    for iparam, param_info in enumerate(params):
         param_name = param_info["name"]
 
-        if param_name in info_dict["arguments"]:
+        if param_name in arg_names:
             # Already dealt with.
             continue
 
         if param_name not in kwargs:
             if param_info["required"] is True:
+                if partial or iparam in bound:
+                    continue
                 raise ValueError(f"Parameter {param_name!r} is required.")
             elif (
                 isinstance(param_info.get("flag_value", None), str)
@@ -311,10 +357,7 @@ def build_command_string(command_info: dict | str | click.Command, *args, **kwar
 
         value = kwargs.get(param_name, param_info["default"])
         _check_type(value, param_info)
-        parsed = parse_value(value, param_info)
-
-        if parsed != "":
-            options.append(parsed)
+        fragments[iparam] = parse_value(value, param_info)
 
         kwargs_consumed.append(param_name)
 
@@ -322,30 +365,647 @@ def build_command_string(command_info: dict | str | click.Command, *args, **kwar
         if kw not in kwargs_consumed:
             raise KeyError(f"Keyword argument {kw!r} is invalid.")
 
-    options_str = "" if len(options) == 0 else (" " + " ".join(options))
-    arguments_str = "" if len(arguments) == 0 else (" " + " ".join(arguments))
+    return fragments
 
-    command_string = command_string_template.format(
-        command_name=info_dict["name"],
-        options=options_str,
-        arguments=arguments_str,
-    )
 
-    return command_string.strip()
+def _join_fragments(info_dict: dict[str, t.Any], fragments: dict[int, str]):
+    """Joins the encoded parameters into a command string."""
+
+    options = []
+    arguments = []
+
+    for iparam in sorted(fragments):
+        fragment = fragments[iparam]
+        if fragment == "":
+            continue
+
+        if info_dict["params"][iparam]["param_type_name"] == "argument":
+            arguments.append(fragment)
+        else:
+            options.append(fragment)
 
+    return " ".join([info_dict["name"], *options, *arguments]).strip()
 
-def create_signature(command_info: dict | str | click.Command):
-    """Creates a `~inspect.Signature` object matching a command callback."""
 
-    if isinstance(command_info, click.Command):
-        command_info = command_to_json(command_info)
+def bind(command_info: dict | str | click.Command, *args, **kwargs):
+    """Returns a command string builder with some parameters already set.
 
-    info_dict: dict[str, t.Any]
+    This works like `functools.partial` for `.build_command_string`. The
+    values in ``args`` and ``kwargs`` are validated and encoded once, and the
+    returned function only processes the parameters passed to it. The
+    builder accepts further positional arguments, which are assigned to the
+    click arguments after the bound ones, and keyword arguments, which can
+    also be used to override bound options. An option overrides all the bound
+    options with the same name, for example a different flag of a group of
+    flags with the same destination. As with `.build_command_string`,
+    ``verify=True`` can be passed to the builder to verify the command string.
 
-    if isinstance(command_info, str):
-        info_dict = json.loads(command_info)
-    else:
-        info_dict = command_info
+    """
+
+    info_dict = schema_cache.get(command_info)
+    params = info_dict["params"]
+
+    bound_fragments = _encode_params(info_dict, args, kwargs, partial=True)
+    n_bound_args = len(args)
+
+    # Parameter name for each bound keyword argument, which can be the flag
+    # value of an option.
+    bound_names: dict[str, str] = {}
+    for param_info in params:
+        flag_value = param_info.get("flag_value", None)
+        for key in [param_info["name"], flag_value]:
+            if isinstance(key, str) and key in kwargs:
+                bound_names[key] = param_info["name"]
+
+    def builder(*builder_args, **builder_kwargs):
+        verify = _pop_verify(info_dict, builder_kwargs)
+
+        fragments = _encode_params(
+            info_dict,
+            builder_args,
+            builder_kwargs,
+            arg_offset=n_bound_args,
+            bound=bound_fragments,
+        )
+
+        # Remove the bound values for the parameters set in the builder.
+        names = {params[iparam]["name"] for iparam in fragments}
+        current_fragments = {
+            iparam: fragment
+            for iparam, fragment in bound_fragments.items()
+            if params[iparam]["name"] not in names
+        }
+        current_kwargs = {
+            key: value for key, value in kwargs.items() if bound_names[key] not in names
+        }
+
+        command_string = _join_fragments(info_dict, {**current_fragments, **fragments})
+
+        if verify:
+            verify_command_string(
+                info_dict,
+                command_string,
+                *args,
+                *builder_args,
+                **{**current_kwargs, **builder_kwargs},
+            )
+
+        return command_string
+
+    return builder
+
+
+def build_chain_string(
+    group_info: dict | str | click.Group,
+    commands: t.Sequence[tuple[str, tuple, dict[str, t.Any]]],
+    *args,
+    **kwargs,
+):
+    """Builds a command string that invokes one or more subcommands of a group.
+
+    ``commands`` is a list of ``(command_name, args, kwargs)`` tuples, each one
+    of them defining the values for a subcommand of the group, as they would be
+    passed to `.build_command_string`. ``args`` and ``kwargs`` are used for the
+    parameters of the group itself. More than one subcommand can only be used
+    if the group has been defined with ``chain=True``.
+
+    All the subcommands are validated before the command string is returned.
+    Since click would assign the name of the next subcommand to an argument
+    of the previous command, a `ValueError` is raised if an optional argument
+    is omitted, or if an argument takes a variable number of values, in the
+    group or in any subcommand other than the last one. Subcommands that are
+    groups themselves are not supported. ``verify=True`` can be passed to
+    parse the full command string back in the same way click does and compare
+    it with the input values (see `.build_command_string`).
+
+    """
+
+    info_dict = schema_cache.get(group_info)
+    verify = _pop_verify(info_dict, kwargs)
+
+    if "commands" not in info_dict:
+        raise ValueError(f"Command {info_dict['name']!r} is not a group.")
+
+    if len(commands) == 0:
+        raise ValueError("At least one subcommand is required.")
+
+    if len(commands) > 1 and not info_dict.get("chain", False):
+        raise ValueError(f"Group {info_dict['name']!r} does not allow chaining.")
+
+    fragments = _encode_params(info_dict, args, kwargs)
+    _check_chain_arguments(info_dict, fragments)
+
+    chain_strings = [_join_fragments(info_dict, fragments)]
+
+    for icommand, (command_name, command_args, command_kwargs) in enumerate(commands):
+        if command_name not in info_dict["commands"]:
+            raise ValueError(f"Command {command_name!r} not found.")
+
+        command_info = info_dict["commands"][command_name]
+        if "commands" in command_info:
+            raise ValueError(
+                f"Command {command_name!r} is a group. Nested groups are not supported."
+            )
+
+        fragments = _encode_params(command_info, command_args, command_kwargs)
+
+        if icommand < len(commands) - 1:
+            _check_chain_arguments(command_info, fragments)
+
+        chain_strings.append(_join_fragments(command_info, fragments))
+
+    command_string = " ".join(chain_strings)
+
+    if verify:
+        _verify_chain_string(info_dict, command_string, commands, args, kwargs)
+
+    return command_string
+
+
+def _check_chain_arguments(info_dict: dict[str, t.Any], fragments: dict[int, str]):
+    """Checks that the arguments of a command cannot consume the next subcommand."""
+
+    command_name = info_dict["name"]
+
+    for iparam, param_info in enumerate(info_dict["params"]):
+        if param_info["param_type_name"] != "argument":
+            continue
+
+        name = param_info["name"]
+        if param_info["nargs"] == -1:
+            raise ValueError(
+                f"Argument {name!r} for command {command_name!r} takes a variable "
+                "number of values and cannot be followed by a subcommand."
+            )
+
+        if fragments.get(iparam, "") == "":
+            raise ValueError(
+                f"Argument {name!r} for command {command_name!r} "
+                "cannot be omitted in a chain."
+            )
+
+
+def _verify_chain_string(
+    info_dict: dict[str, t.Any],
+    command_string: str,
+    commands: t.Sequence[tuple[str, tuple, dict[str, t.Any]]],
+    args: tuple,
+    kwargs: dict[str, t.Any],
+):
+    """Verifies a command string created by `.build_chain_string`.
+
+    The group and the chained subcommands are parsed without interspersed
+    arguments and pass the unused tokens to the next subcommand, as click does.
+
+    """
+
+    tokens = _split_command_string(command_string)
+
+    group_name = info_dict["name"]
+    if len(tokens) == 0 or tokens[0] != group_name:
+        raise ValueError(f"Command string does not start with {group_name!r}.")
+
+    values, rest = _parse_tokens(info_dict, tokens[1:], interspersed=False)
+    _check_values(info_dict, values, command_string, args, kwargs)
+
+    is_chain = info_dict.get("chain", False)
+
+    for command_name, command_args, command_kwargs in commands:
+        if len(rest) == 0 or rest[0] != command_name:
+            raise ValueError(
+                f"Expected command {command_name!r} in command string "
+                f"{command_string!r}, found {rest[0] if rest else None!r}."
+            )
+
+        command_info = info_dict["commands"][command_name]
+        values, rest = _parse_tokens(
+            command_info,
+            rest[1:],
+            interspersed=not is_chain,
+        )
+        _check_values(
+            command_info,
+            values,
+            command_string,
+            command_args,
+            command_kwargs,
+        )
+
+    if len(rest) > 0:
+        raise ValueError(f"Unexpected extra arguments {rest!r}.")
+
+
+def build_batch_string(
+    commands: t.Sequence[tuple[dict | str | click.Command, tuple, dict[str, t.Any]]],
+    delimiter: str = "\n",
+    verify: bool = False,
+):
+    """Builds several command strings and joins them with a delimiter.
+
+    ``commands`` is a list of ``(command_info, args, kwargs)`` tuples that are
+    passed to `.build_command_string`. A `ValueError` is raised if the
+    delimiter is empty or if any of the command strings contains the
+    delimiter. If ``verify=True``, each command string is checked with
+    `.verify_command_string`.
+
+    """
+
+    if delimiter == "":
+        raise ValueError("The delimiter cannot be an empty string.")
+
+    command_strings = []
+
+    for command_info, args, kwargs in commands:
+        command_string = build_command_string(command_info, *args, **kwargs)
+
+        if verify:
+            verify_command_string(command_info, command_string, *args, **kwargs)
+
+        if delimiter in command_string:
+            raise ValueError(
+                f"Command string {command_string!r} contains "
+                f"the delimiter {delimiter!r}."
+            )
+
+        command_strings.append(command_string)
+
+    return delimiter.join(command_strings)
+
+
+def _make_parser(info_dict: dict[str, t.Any], interspersed: bool = True):
+    """Creates a click `.OptionParser` from the command information.
+
+    If ``interspersed=False``, options are not processed after the first
+    positional value, as click does for groups and chained subcommands.
+
+    """
+
+    parser = OptionParser()
+    parser.allow_interspersed_args = interspersed
+
+    for param_info in info_dict["params"]:
+        name = param_info["name"]
+        obj = types.SimpleNamespace(_flag_needs_value=False, **param_info)
+
+        if param_info["param_type_name"] == "argument":
+            parser.add_argument(obj, name, nargs=param_info["nargs"])
+            continue
+
+        if param_info.get("multiple", False):
+            action = "append"
+        elif param_info.get("count", False):
+            action = "count"
+        else:
+            action = "store"
+
+        if param_info.get("is_flag", False):
+            action = f"{action}_const"
+            secondary_opts = param_info.get("secondary_opts", [])
+            is_bool = param_info["type"]["param_type"].lower() == "bool"
+            if is_bool and secondary_opts != []:
+                parser.add_option(obj, param_info["opts"], name, action, const=True)
+                parser.add_option(obj, secondary_opts, name, action, const=False)
+            else:
+                const = param_info["flag_value"]
+                parser.add_option(obj, param_info["opts"], name, action, const=const)
+        else:
+            nargs = param_info["nargs"]
+            parser.add_option(obj, param_info["opts"], name, action, nargs=nargs)
+
+    return parser
+
+
+class _CacheEntry:
+    """The information and parser for a command stored in a `.SchemaCache`."""
+
+    __slots__ = ("command_info", "info_dict", "parsers")
+
+    def __init__(self, command_info: t.Any, info_dict: dict[str, t.Any]):
+        self.command_info = command_info
+        self.info_dict = info_dict
+        self.parsers: dict[bool, OptionParser] = {}
+
+
+class SchemaCache:
+    """A bounded cache of parsed command information that is safe to share.
+
+    Maps a command, either as a JSON string or a dictionary, to its parsed
+    information and, when needed, the click parser created from it. JSON
+    strings are cached by value, and dictionaries by identity, so a
+    dictionary must not be modified once it has been used. Click commands are
+    not cached, since parameters and subcommands can be added to them at any
+    time; their information is generated on each call.
+
+    Reads do not acquire a lock and rely on dictionary lookups being atomic,
+    which is true both with and without the GIL. Insertions take a lock and,
+    if the cache is full, evict the oldest entry first. Entries are never
+    modified once inserted, except for adding parsers, so a concurrent
+    reader always sees a consistent entry. Recently read entries are not
+    promoted, since that would require a write on the read path.
+
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+
+        self._entries: dict[t.Any, _CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get_entry(self, command_info: dict | str | click.Command):
+        """Returns the cache entry for a command, creating it if needed."""
+
+        if isinstance(command_info, click.Command):
+            info_dict = json.loads(command_to_json(command_info))
+            return _CacheEntry(command_info, info_dict)
+
+        # The entry holds a reference to the dictionary, so its id cannot be
+        # reused while the entry is in the cache.
+        key = id(command_info) if isinstance(command_info, dict) else command_info
+
+        entry = self._entries.get(key, None)
+        if entry is not None:
+            return entry
+
+        if isinstance(command_info, str):
+            info_dict = json.loads(command_info)
+        else:
+            info_dict = command_info
+
+        entry = _CacheEntry(command_info, info_dict)
+
+        with self._lock:
+            self._entries.pop(key, None)
+            while len(self._entries) >= max(self.maxsize, 1):
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = entry
+
+        return entry
+
+    def get(self, command_info: dict | str | click.Command) -> dict[str, t.Any]:
+        """Returns the information dictionary for a command."""
+
+        return self._get_entry(command_info).info_dict
+
+    def get_parser(
+        self,
+        command_info: dict | str | click.Command,
+        interspersed: bool = True,
+    ) -> OptionParser:
+        """Returns the click parser for a command. See `._make_parser`."""
+
+        entry = self._get_entry(command_info)
+
+        # Two threads may create the parser at the same time. That is harmless
+        # since both parsers are equivalent.
+        parser = entry.parsers.get(interspersed, None)
+        if parser is None:
+            parser = _make_parser(entry.info_dict, interspersed=interspersed)
+            entry.parsers[interspersed] = parser
+
+        return parser
+
+    def clear(self):
+        """Removes all the entries in the cache."""
+
+        with self._lock:
+            self._entries.clear()
+
+
+#: The cache used by the functions in this module.
+schema_cache = SchemaCache()
+
+
+def _convert_value(value: t.Any, type_info: dict[str, t.Any]):
+    """Converts a value returned by the option parser to its Python type."""
+
+    if value is None or isinstance(value, bool):
+        return value
+
+    param_type = type_info["param_type"].lower()
+
+    if param_type == "tuple":
+        return tuple(
+            _convert_value(vv, type_info["types"][ii]) for ii, vv in enumerate(value)
+        )
+
+    if isinstance(value, (tuple, list)):
+        return tuple(_convert_value(vv, type_info) for vv in value)
+
+    try:
+        if param_type == "int":
+            return int(value)
+        elif param_type == "float":
+            return float(value)
+        elif param_type == "bool":
+            return click.BOOL.convert(value, None, None)
+    except (ValueError, click.BadParameter):
+        raise ValueError(f"Cannot convert {value!r} to type {param_type!r}.")
+
+    return value
+
+
+def _get_default(param_infos: list[dict[str, t.Any]]):
+    """Returns the default value for a group of options with the same name."""
+
+    for param_info in param_infos:
+        flag_value = param_info.get("flag_value", None)
+        if param_info.get("is_flag", False) and isinstance(flag_value, str):
+            if param_info["default"] is True:
+                return flag_value
+
+    default = param_infos[0].get("default", None)
+    if isinstance(default, list):
+        return tuple(default)
+
+    return default
+
+
+def parse_command_string(
+    command_info: dict | str | click.Command,
+    command_string: str,
+    defaults: bool = True,
+):
+    """Parses a command string and returns the value of each parameter.
+
+    This is the inverse of `.build_command_string`. The command string is
+    parsed using click's low-level option parser, which is cached for each
+    command. Values are converted to their Python types but no further
+    validation is done. Parameters not present in the command string are
+    set to their default values or, if ``defaults=False``, not included in
+    the output.
+
+    """
+
+    tokens = _split_command_string(command_string)
+
+    command_name = schema_cache.get(command_info)["name"]
+    if len(tokens) == 0 or tokens[0] != command_name:
+        raise ValueError(f"Command string does not start with {command_name!r}.")
+
+    values, largs = _parse_tokens(command_info, tokens[1:], defaults=defaults)
+
+    if len(largs) > 0:
+        raise ValueError(f"Unexpected extra arguments {largs!r}.")
+
+    return values
+
+
+def _split_command_string(command_string: str):
+    """Splits a command string into tokens as a shell would."""
+
+    try:
+        return shlex.split(command_string)
+    except ValueError as err:
+        raise ValueError(f"Cannot split command string {command_string!r}: {err}")
+
+
+def _parse_tokens(
+    command_info: dict | str | click.Command,
+    tokens: list[str],
+    defaults: bool = True,
+    interspersed: bool = True,
+):
+    """Parses the tokens after the command name.
+
+    Returns the parameter values (see `.parse_command_string`) and the list of
+    tokens that were not consumed by the command.
+
+    """
+
+    info_dict = schema_cache.get(command_info)
+    parser = schema_cache.get_parser(command_info, interspersed=interspersed)
+
+    return _parse_with_parser(info_dict, parser, tokens, defaults=defaults)
+
+
+def _parse_with_parser(
+    info_dict: dict[str, t.Any],
+    parser: OptionParser,
+    tokens: list[str],
+    defaults: bool = True,
+):
+    """Parses tokens with a parser created by `._make_parser`.
+
+    Does not use the schema cache. See `._parse_tokens`.
+
+    """
+
+    try:
+        opts, largs, _ = parser.parse_args(tokens)
+    except click.UsageError as err:
+        raise ValueError(f"Cannot parse command string: {err.message}")
+
+    groups: dict[str, list[dict[str, t.Any]]] = {}
+    for param_info in info_dict["params"]:
+        groups.setdefault(param_info["name"], []).append(param_info)
+
+    values: dict[str, t.Any] = {}
+    for name, param_infos in groups.items():
+        if name in opts and (defaults or opts[name] is not None):
+            values[name] = _convert_value(opts[name], param_infos[0]["type"])
+        elif defaults:
+            values[name] = _get_default(param_infos)
+
+    return values, largs
+
+
+def _expected_values(info_dict: dict[str, t.Any], args: tuple, kwargs: dict):
+    """Maps the inputs of `.build_command_string` to parameter values."""
+
+    expected: dict[str, t.Any] = {}
+
+    arguments = [
+        param_info["name"]
+        for param_info in info_dict["params"]
+        if param_info["param_type_name"] == "argument"
+    ]
+
+    for iarg, arg_name in enumerate(arguments):
+        if iarg < len(args):
+            expected[arg_name] = args[iarg]
+        elif arg_name in kwargs:
+            expected[arg_name] = kwargs[arg_name]
+
+    for param_info in info_dict["params"]:
+        name = param_info["name"]
+        if name in arguments:
+            continue
+
+        flag_value = param_info.get("flag_value", None)
+        if name in kwargs:
+            expected[name] = kwargs[name]
+        elif isinstance(flag_value, str) and flag_value in kwargs:
+            # Flags with string values (--bias/--dark) passed as bias=True.
+            if kwargs[flag_value] is True:
+                expected[name] = flag_value
+
+    return expected
+
+
+def _values_match(expected: t.Any, value: t.Any):
+    """Compares an input value with the value parsed from a command string."""
+
+    if isinstance(expected, (tuple, list)) and isinstance(value, (tuple, list)):
+        if len(expected) != len(value):
+            return False
+        return all(_values_match(ee, vv) for ee, vv in zip(expected, value))
+
+    if isinstance(value, str) and not isinstance(expected, str):
+        # Untyped parameters are compared by their string representation.
+        return value == str(expected)
+
+    return expected == value
+
+
+def verify_command_string(
+    command_info: dict | str | click.Command,
+    command_string: str,
+    *args,
+    **kwargs,
+):
+    """Checks that a command string parses back to the intended values.
+
+    ``args`` and ``kwargs`` must be the same values passed to
+    `.build_command_string`. The command string is parsed using
+    `.parse_command_string` and each of the input values is compared with
+    the parsed value. Inputs with value `None` are ignored. Raises a
+    `ValueError` if any of the values does not match.
+
+    """
+
+    values = parse_command_string(command_info, command_string)
+    _check_values(command_info, values, command_string, args, kwargs)
+
+
+def _check_values(
+    command_info: dict | str | click.Command,
+    values: dict[str, t.Any],
+    command_string: str,
+    args: tuple,
+    kwargs: dict[str, t.Any],
+):
+    """Compares parsed values with the inputs of `.build_command_string`."""
+
+    info_dict = schema_cache.get(command_info)
+
+    for name, value in _expected_values(info_dict, args, kwargs).items():
+        if value is None:
+            continue
+
+        if not _values_match(value, values[name]):
+            raise ValueError(
+                f"Value for parameter {name!r} in command string {command_string!r} "
+                f"is {values[name]!r}, expected {value!r}."
+            )
+
+
+def create_signature(command_info: dict | str | click.Command):
+    """Creates a `~inspect.Signature` object matching a command callback."""
+
+    info_dict = schema_cache.get(command_info)
 
     info_dict = _add_extra_info(info_dict)
 
@@ -386,15 +1046,7 @@ def create_function(
 ):
     """Creates a function with a signature matching a command callback."""
 
-    if isinstance(command_info, click.Command):
-        command_info = command_to_json(command_info)
-
-    info_dict: dict[str, t.Any]
-
-    if isinstance(command_info, str):
-        info_dict = json.loads(command_info)
-    else:
-        info_dict = command_info
+    info_dict = schema_cache.get(command_info)
 
     sign = create_signature(info_dict)
 
@@ -0,0 +1,400 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: logs.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+from __future__ import annotations
+
+import collections
+import json
+import mmap
+import os
+import pathlib
+import re
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import typing as t
+
+import click
+
+from .core import (
+    OptionParser,
+    _make_parser,
+    _parse_with_parser,
+    _split_command_string,
+    command_to_json,
+)
+
+
+__all__ = ["parse_log", "write_jsonl", "write_parquet"]
+
+
+#: Default size in bytes of the chunks processed by each worker.
+CHUNK_SIZE = 64 * 1024**2
+
+# Command information, parsers, and line pattern in a worker process.
+_worker_state: dict[str, t.Any] = {}
+
+
+def _init_worker(command_jsons: list[str], pattern: str | None):
+    """Stores the command information and parsers in a worker process.
+
+    The parsers are created once for each command and subcommand, and not
+    stored in the shared schema cache, which may be smaller than the number
+    of commands. Groups and subcommands of chained groups are parsed without
+    interspersed arguments, as click does.
+
+    """
+
+    commands: dict[str, tuple[dict[str, t.Any], OptionParser]] = {}
+
+    def add_commands(info_dict: dict[str, t.Any], path: str, interspersed: bool):
+        is_group = "commands" in info_dict
+        parser = _make_parser(info_dict, interspersed=interspersed and not is_group)
+        commands[path] = (info_dict, parser)
+
+        is_chain = info_dict.get("chain", False)
+        for subcommand_name, subcommand_info in info_dict.get("commands", {}).items():
+            add_commands(subcommand_info, f"{path} {subcommand_name}", not is_chain)
+
+    for command_json in command_jsons:
+        info_dict = json.loads(command_json)
+        add_commands(info_dict, info_dict["name"], True)
+
+    _worker_state["commands"] = commands
+    _worker_state["pattern"] = re.compile(pattern) if pattern else None
+
+
+def _parse_params(path: str, tokens: list[str]):
+    """Parses the parameters of a command and returns the unused tokens."""
+
+    info_dict, parser = _worker_state["commands"][path]
+
+    return _parse_with_parser(info_dict, parser, tokens, defaults=False)
+
+
+def _split_values(info_dict: dict[str, t.Any], values: dict[str, t.Any]):
+    """Splits the parameter values in arguments and options."""
+
+    args = []
+    kwargs = {}
+    for param_info in info_dict["params"]:
+        name = param_info["name"]
+        if name not in values:
+            continue
+        if param_info["param_type_name"] == "argument":
+            args.append(values[name])
+        else:
+            kwargs[name] = values[name]
+
+    return args, kwargs
+
+
+def _parse_line(command_string: str):
+    """Parses a command string and returns the commands it invokes.
+
+    Groups are walked down in the same way as click does: the parameters of
+    each group are parsed first and the next token is the subcommand. All the
+    subcommands of a chained group are parsed. Returns a list with the path,
+    arguments, and options of each command that is not a group, and a
+    dictionary of group path to the parameter values of that group.
+
+    """
+
+    commands = _worker_state["commands"]
+
+    tokens = _split_command_string(command_string)
+    if len(tokens) == 0 or tokens[0] not in commands:
+        raise ValueError("Unknown command.")
+
+    path = tokens[0]
+    rest = tokens[1:]
+
+    invoked: list[tuple[str, list, dict[str, t.Any]]] = []
+    groups: dict[str, dict[str, t.Any]] = {}
+
+    while True:
+        info_dict, _ = commands[path]
+        values, rest = _parse_params(path, rest)
+
+        if "commands" not in info_dict:
+            invoked.append((path, *_split_values(info_dict, values)))
+            break
+
+        groups[path] = values
+
+        if len(rest) == 0:
+            raise ValueError(f"Missing command for group {path!r}.")
+
+        if not info_dict.get("chain", False):
+            if f"{path} {rest[0]}" not in commands:
+                raise ValueError(f"No such command {rest[0]!r} in group {path!r}.")
+            path = f"{path} {rest[0]}"
+            rest = rest[1:]
+            continue
+
+        while len(rest) > 0:
+            subcommand_path = f"{path} {rest[0]}"
+            if subcommand_path not in commands:
+                raise ValueError(f"No such command {rest[0]!r} in group {path!r}.")
+            values, rest = _parse_params(subcommand_path, rest[1:])
+            subcommand_info, _ = commands[subcommand_path]
+            invoked.append((subcommand_path, *_split_values(subcommand_info, values)))
+
+        break
+
+    if len(rest) > 0:
+        raise ValueError(f"Unexpected extra arguments {rest!r}.")
+
+    return invoked, groups
+
+
+def _parse_chunk(path: str, start: int, end: int):
+    """Parses the lines between two byte offsets of a log file."""
+
+    pattern: re.Pattern | None = _worker_state["pattern"]
+
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = mm[start:end]
+
+    records = []
+
+    offset = start
+    for line_bytes in data.split(b"\n"):
+        line_offset = offset
+        offset += len(line_bytes) + 1
+
+        line = line_bytes.decode("utf-8", errors="replace").strip()
+        if line == "":
+            continue
+
+        if pattern is None:
+            command_string = line
+        else:
+            match = pattern.search(line)
+            if match is None:
+                continue
+            command_string = match.group("command").strip()
+
+        record = {
+            "offset": line_offset,
+            "command": None,
+            "args": None,
+            "kwargs": None,
+            "groups": None,
+            "error": None,
+        }
+
+        try:
+            invoked, groups = _parse_line(command_string)
+        except ValueError as err:
+            records.append({**record, "error": str(err)})
+            continue
+
+        for command, args, kwargs in invoked:
+            records.append(
+                {
+                    **record,
+                    "command": command,
+                    "args": args,
+                    "kwargs": kwargs,
+                    "groups": groups,
+                }
+            )
+
+    return records
+
+
+def _get_chunks(path: str, chunk_size: int):
+    """Splits a file in chunks of approximately ``chunk_size`` full lines."""
+
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+
+    chunks = []
+
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < size:
+                newline = mm.find(b"\n", min(start + chunk_size, size) - 1)
+                end = size if newline == -1 else newline + 1
+                chunks.append((start, end))
+                start = end
+
+    return chunks
+
+
+def parse_log(
+    path: str | os.PathLike,
+    commands: t.Iterable[dict | str | click.Command],
+    pattern: str | None = None,
+    workers: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> t.Iterator[dict[str, t.Any]]:
+    """Parses the command strings in a log file.
+
+    The file is memory-mapped and split in chunks of approximately
+    ``chunk_size`` bytes, which are processed by a pool of ``workers``
+    processes (defaults to the number of CPUs). If ``workers=0`` the chunks
+    are processed in the current process. Records are yielded in the same
+    order as the lines in the file, while only a few chunks are held in
+    memory at any time.
+
+    Each line is matched to one of the ``commands`` using its first word and
+    parsed in the same way as click does, including the options of groups
+    and the subcommands of chained groups. If ``pattern`` is provided, it
+    must be a regular expression with a named group ``command`` that extracts
+    the command string from each line. Lines that do not match the pattern
+    and empty lines are ignored.
+
+    Yields a dictionary for each command invoked in a line (one for each
+    subcommand of a chained group) with the byte ``offset`` of the line in
+    the file, the ``command`` path, the ``args`` and ``kwargs`` present in
+    the command string, a ``groups`` dictionary of group path to the values
+    of the group parameters present in the command string, and an ``error``
+    message if the line cannot be parsed (in which case a single record is
+    yielded for the line and the other values are `None`). Raises a
+    `ValueError` if ``chunk_size`` is not positive or ``pattern`` does not
+    have a ``command`` group.
+
+    """
+
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive number of bytes.")
+
+    if pattern is not None and "command" not in re.compile(pattern).groupindex:
+        raise ValueError("The pattern must have a named group 'command'.")
+
+    path = str(pathlib.Path(path))
+    command_jsons = [_get_command_json(command) for command in commands]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    return _iter_records(path, command_jsons, pattern, workers, chunk_size)
+
+
+def _get_command_json(command_info: dict | str | click.Command):
+    """Returns the JSON string of a command without using the schema cache."""
+
+    if isinstance(command_info, click.Command):
+        return command_to_json(command_info)
+    elif isinstance(command_info, str):
+        return command_info
+
+    return json.dumps(command_info)
+
+
+def _iter_records(
+    path: str,
+    command_jsons: list[str],
+    pattern: str | None,
+    workers: int,
+    chunk_size: int,
+):
+    """Yields the records of a log file. See `.parse_log`."""
+
+    chunks = _get_chunks(path, chunk_size)
+
+    if workers == 0:
+        _init_worker(command_jsons, pattern)
+        for start, end in chunks:
+            yield from _parse_chunk(path, start, end)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(command_jsons, pattern),
+    ) as executor:
+        pending: collections.deque[Future] = collections.deque()
+
+        for start, end in chunks:
+            pending.append(executor.submit(_parse_chunk, path, start, end))
+            # Limit the number of chunks held in memory.
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+
+        while len(pending) > 0:
+            yield from pending.popleft().result()
+
+
+def write_jsonl(records: t.Iterable[dict[str, t.Any]], path: str | os.PathLike):
+    """Writes records from `.parse_log` to a JSON Lines file.
+
+    Returns the number of records written.
+
+    """
+
+    n_records = 0
+
+    with open(path, "w") as file:
+        for record in records:
+            file.write(json.dumps(record) + "\n")
+            n_records += 1
+
+    return n_records
+
+
+def write_parquet(
+    records: t.Iterable[dict[str, t.Any]],
+    path: str | os.PathLike,
+    batch_size: int = 100_000,
+):
+    """Writes records from `.parse_log` to a Parquet file.
+
+    Requires ``pyarrow``. Since the parameters differ between commands, the
+    ``args``, ``kwargs``, and ``groups`` columns are stored as JSON strings. Records are
+    written in batches of ``batch_size``. Returns the number of records
+    written.
+
+    """
+
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("pyarrow is required to write Parquet files.")
+
+    schema = pyarrow.schema(
+        [
+            ("offset", pyarrow.int64()),
+            ("command", pyarrow.string()),
+            ("args", pyarrow.string()),
+            ("kwargs", pyarrow.string()),
+            ("groups", pyarrow.string()),
+            ("error", pyarrow.string()),
+        ]
+    )
+
+    def write_batch(writer: pyarrow.parquet.ParquetWriter, batch: list[dict]):
+        columns = {name: [record[name] for record in batch] for name in schema.names}
+        for name in ["args", "kwargs", "groups"]:
+            columns[name] = [
+                json.dumps(value) if value is not None else None
+                for value in columns[name]
+            ]
+        writer.write_table(pyarrow.table(columns, schema=schema))
+
+    n_records = 0
+
+    with pyarrow.parquet.ParquetWriter(str(path), schema) as writer:
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                write_batch(writer, batch)
+                n_records += len(batch)
+                batch = []
+
+        if len(batch) > 0:
+            write_batch(writer, batch)
+            n_records += len(batch)
+
+    return n_records
@@ -0,0 +1,398 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: static.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+from __future__ import annotations
+
+import ast
+import importlib
+import importlib.util
+import os
+import pathlib
+
+import typing as t
+
+import click
+
+from .core import command_to_json
+
+
+__all__ = ["source_to_json"]
+
+
+# Builtins that can be used as parameter types.
+_BUILTIN_TYPES = {"str": str, "int": int, "float": float, "bool": bool}
+
+# Keyword arguments that do not affect the command information.
+_IGNORED_KEYWORDS = ["callback", "shell_complete"]
+
+# Decorators that do not modify the command parameters.
+_IGNORED_DECORATORS = ["pass_context", "pass_obj"]
+
+
+class _DynamicNodeError(Exception):
+    """Raised when a node cannot be evaluated statically."""
+
+    def __init__(self, node: ast.AST):
+        super().__init__(node)
+        self.node = node
+
+
+class _Scope:
+    """Names defined at the module level that can be evaluated statically."""
+
+    def __init__(self):
+        self.click_modules: set[str] = set()
+        self.click_names: dict[str, str] = {}
+        self.constants: dict[str, t.Any] = {}
+
+    def get_click_attribute(self, node: ast.expr) -> str | None:
+        """Returns the name of the click attribute a node refers to, if any."""
+
+        if isinstance(node, ast.Name):
+            return self.click_names.get(node.id, None)
+
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+            if node.value.id in self.click_modules:
+                return node.attr
+
+        return None
+
+
+def _is_param_type(value: t.Any):
+    """Checks if a value is a click parameter type or a subclass of it."""
+
+    if isinstance(value, click.ParamType):
+        return True
+
+    return isinstance(value, type) and issubclass(value, click.ParamType)
+
+
+def _evaluate(node: ast.expr, scope: _Scope) -> t.Any:
+    """Evaluates a node that only contains literals and click types."""
+
+    if isinstance(node, ast.Constant):
+        return node.value
+
+    if isinstance(node, (ast.Tuple, ast.List, ast.Set)):
+        if any(isinstance(elt, ast.Starred) for elt in node.elts):
+            raise _DynamicNodeError(node)
+        values = [_evaluate(elt, scope) for elt in node.elts]
+        if isinstance(node, ast.Tuple):
+            return tuple(values)
+        elif isinstance(node, ast.Set):
+            return set(values)
+        return values
+
+    if isinstance(node, ast.Dict):
+        if any(key is None for key in node.keys):
+            raise _DynamicNodeError(node)
+        return {
+            _evaluate(key, scope): _evaluate(value, scope)  # type: ignore
+            for key, value in zip(node.keys, node.values)
+        }
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        operand = _evaluate(node.operand, scope)
+        if isinstance(operand, (int, float)):
+            return -operand if isinstance(node.op, ast.USub) else operand
+
+    if isinstance(node, ast.Name):
+        if node.id in scope.constants:
+            return scope.constants[node.id]
+        if node.id in _BUILTIN_TYPES:
+            return _BUILTIN_TYPES[node.id]
+
+    click_attribute = scope.get_click_attribute(node)
+    if click_attribute is not None:
+        value = getattr(click, click_attribute, None)
+        if _is_param_type(value):
+            return value
+
+    if isinstance(node, ast.Call):
+        try:
+            func = _evaluate(node.func, scope)
+        except _DynamicNodeError:
+            raise _DynamicNodeError(node)
+        if isinstance(func, type) and issubclass(func, click.ParamType):
+            args = [_evaluate(arg, scope) for arg in node.args]
+            kwargs = {}
+            for keyword in node.keywords:
+                if keyword.arg is None:
+                    raise _DynamicNodeError(node)
+                kwargs[keyword.arg] = _evaluate(keyword.value, scope)
+            return func(*args, **kwargs)
+
+    raise _DynamicNodeError(node)
+
+
+def _get_decorator_kind(decorator: ast.expr, scope: _Scope):
+    """Returns the name of a decorator and the parent group, if any.
+
+    The parent is the name of the object used as decorator for commands
+    defined as ``@<parent>.command()``.
+
+    """
+
+    target = decorator.func if isinstance(decorator, ast.Call) else decorator
+
+    click_attribute = scope.get_click_attribute(target)
+    if click_attribute is not None:
+        return click_attribute, None
+
+    if (
+        isinstance(target, ast.Attribute)
+        and isinstance(target.value, ast.Name)
+        and target.attr in ["command", "group"]
+    ):
+        return target.attr, target.value.id
+
+    return None, None
+
+
+def _parse_decorator(decorator: ast.expr, scope: _Scope):
+    """Returns the type of a decorator and its arguments.
+
+    The type is ``"command"``, ``"group"``, ``"option"``, ``"argument"``, or
+    ``"ignore"``. Raises `._DynamicNodeError` if the decorator is not known or
+    its arguments cannot be evaluated statically.
+
+    """
+
+    kind, _ = _get_decorator_kind(decorator, scope)
+
+    if kind in _IGNORED_DECORATORS:
+        return "ignore", [], {}
+    elif kind not in ["command", "group", "option", "argument"]:
+        raise _DynamicNodeError(decorator)
+
+    if not isinstance(decorator, ast.Call):
+        return kind, [], {}
+
+    args = []
+    for arg_node in decorator.args:
+        if isinstance(arg_node, ast.Starred):
+            raise _DynamicNodeError(decorator)
+        args.append(_evaluate(arg_node, scope))
+
+    kwargs = {}
+    for keyword in decorator.keywords:
+        if keyword.arg is None:
+            raise _DynamicNodeError(decorator)
+        if keyword.arg in _IGNORED_KEYWORDS:
+            continue
+        kwargs[keyword.arg] = _evaluate(keyword.value, scope)
+
+    return kind, args, kwargs
+
+
+def _get_command_decorator(func: ast.FunctionDef | ast.AsyncFunctionDef, scope: _Scope):
+    """Returns the command decorator of a function and its parent, if any."""
+
+    for decorator in func.decorator_list:
+        kind, parent = _get_decorator_kind(decorator, scope)
+        if kind in ["command", "group"]:
+            return decorator, parent
+
+    return None, None
+
+
+def _get_docstring(func: ast.FunctionDef | ast.AsyncFunctionDef) -> str | None:
+    """Returns the docstring of a function as set by the running interpreter.
+
+    The docstring is compiled in an empty function so that it is processed in
+    the same way as in the imported module (Python 3.13 and later remove the
+    common indentation of the docstring lines).
+
+    """
+
+    if ast.get_docstring(func, clean=False) is None:
+        return None
+
+    module = ast.parse("def stub():\n    pass\n")
+    t.cast(ast.FunctionDef, module.body[0]).body = [func.body[0]]
+
+    namespace: dict[str, t.Any] = {}
+    exec(compile(module, "<docstring>", "exec"), namespace)
+
+    return namespace["stub"].__doc__
+
+
+def _build_command(func: ast.FunctionDef | ast.AsyncFunctionDef, scope: _Scope):
+    """Creates a click command by applying the decorators to a stub function."""
+
+    def stub():
+        pass
+
+    stub.__name__ = func.name
+    stub.__qualname__ = func.name
+    stub.__doc__ = _get_docstring(func)
+
+    obj: t.Any = stub
+
+    # Decorators are applied bottom to top.
+    for decorator in reversed(func.decorator_list):
+        kind, args, kwargs = _parse_decorator(decorator, scope)
+
+        if kind == "option":
+            obj = click.option(*args, **kwargs)(obj)
+        elif kind == "argument":
+            obj = click.argument(*args, **kwargs)(obj)
+        elif kind == "command":
+            obj = click.command(*args, **kwargs)(obj)
+        elif kind == "group":
+            obj = click.group(*args, **kwargs)(obj)
+
+    return obj
+
+
+def _update_scope(node: ast.stmt, scope: _Scope):
+    """Updates the scope with the imports and constants in a statement."""
+
+    if isinstance(node, ast.Import):
+        for alias in node.names:
+            if alias.name == "click":
+                scope.click_modules.add(alias.asname or alias.name)
+
+    elif isinstance(node, ast.ImportFrom):
+        if node.module == "click" and node.level == 0:
+            for alias in node.names:
+                scope.click_names[alias.asname or alias.name] = alias.name
+
+    elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        if len(targets) != 1 or not isinstance(targets[0], ast.Name):
+            return
+
+        name = targets[0].id
+        scope.constants.pop(name, None)
+
+        if node.value is None:
+            return
+
+        try:
+            scope.constants[name] = _evaluate(node.value, scope)
+        except _DynamicNodeError:
+            pass
+
+
+def _import_module(path: pathlib.Path, module_name: str | None):
+    """Imports a module by name or, if the name is not known, from its path."""
+
+    if module_name is not None:
+        return importlib.import_module(module_name)
+
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    if spec is None or spec.loader is None:
+        raise ValueError(f"Cannot import module from {str(path)!r}.")
+
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def source_to_json(
+    path: str | os.PathLike,
+    module_name: str | None = None,
+    fallback: bool = True,
+) -> dict[str, str]:
+    """Generates the JSON representation of the click commands in a file.
+
+    The file is parsed statically and the decorators of each command are
+    applied to a stub function, so the module is not imported and the output
+    matches that of `.command_to_json`. Only literals, module-level constants,
+    and click parameter types can be used as decorator arguments. Commands
+    defined as ``@<group>.command()`` are added to the group if it is defined
+    in the same file; otherwise they are returned as top-level commands. The
+    default click command and group classes are assumed.
+
+    If a command cannot be parsed statically (for example, if it uses a custom
+    decorator or a default value computed at runtime) and ``fallback=True``,
+    the module is imported, using ``module_name`` if provided, and
+    `.command_to_json` is called with the imported command. Otherwise, a
+    `ValueError` is raised.
+
+    Returns a dictionary of command name to JSON representation for each
+    top-level command.
+
+    """
+
+    path = pathlib.Path(path)
+    source = path.read_text()
+    tree = ast.parse(source, filename=str(path))
+
+    scope = _Scope()
+
+    commands: dict[str, t.Any] = {}
+    parents: dict[str, str | None] = {}
+    dynamic: dict[str, str] = {}
+
+    for node in tree.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            _update_scope(node, scope)
+            continue
+
+        decorator, parent = _get_command_decorator(node, scope)
+        if decorator is None:
+            continue
+
+        parents[node.name] = parent
+
+        try:
+            commands[node.name] = _build_command(node, scope)
+        except _DynamicNodeError as err:
+            segment = ast.get_source_segment(source, err.node) or ""
+            dynamic[node.name] = f"cannot evaluate {' '.join(segment.split())}"
+        except (TypeError, ValueError) as err:
+            dynamic[node.name] = str(err)
+
+    # Find the top-level command for each command defined in the file.
+    roots: dict[str, str] = {}
+    for func_name in parents:
+        root = func_name
+        while parents[root] is not None and parents[root] in parents:
+            root = t.cast(str, parents[root])
+        roots[func_name] = root
+
+    dynamic_roots = {roots[func_name]: reason for func_name, reason in dynamic.items()}
+
+    for func_name, parent in parents.items():
+        if roots[func_name] in dynamic_roots or parent not in parents:
+            continue
+
+        group = commands[t.cast(str, parent)]
+        if not isinstance(group, click.Group):
+            dynamic_roots[roots[func_name]] = f"{parent!r} is not a group"
+            continue
+
+        group.add_command(commands[func_name])
+
+    if len(dynamic_roots) > 0 and not fallback:
+        func_name, reason = next(iter(dynamic_roots.items()))
+        raise ValueError(f"Cannot parse command {func_name!r} statically: {reason}.")
+
+    module = None
+    command_jsons: dict[str, str] = {}
+
+    for func_name in parents:
+        if roots[func_name] != func_name:
+            continue
+
+        if func_name in dynamic_roots:
+            if module is None:
+                module = _import_module(path, module_name)
+            command = getattr(module, func_name)
+        else:
+            command = commands[func_name]
+
+        if not isinstance(command, click.Command):
+            raise ValueError(f"{func_name!r} is not a click command.")
+
+        command_jsons[command.name] = command_to_json(command)
+
+    return command_jsons
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: test_bind.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+from __future__ import annotations
+
+import click
+import pytest
+
+from unclick import bind, build_command_string
+
+
+@click.command(name="test-command")
+@click.argument("ARG1", type=str)
+@click.argument("ARG2", type=int, required=False)
+@click.option("--flag1", "-f", is_flag=True)
+@click.option("--option2", "-o", type=float, default=3.0)
+@click.option("--required", type=int, required=True)
+def command(*args, **kwrgs):
+    return
+
+
+def test_bind():
+    builder = bind(command, "hi", flag1=True)
+
+    assert builder(required=1) == 'test-command --flag1 --required 1 "hi"'
+    assert builder(2, required=1) == 'test-command --flag1 --required 1 "hi" 2'
+
+
+@pytest.mark.parametrize(
+    "bind_args,bind_kwargs,args,kwargs",
+    [
+        ((), {}, ("hi",), {"required": 1}),
+        (("hi",), {}, (5,), {"required": 1, "option2": 1.5}),
+        ((), {"required": 2}, ("hi",), {"flag1": True}),
+        ((), {"arg1": "hi", "option2": 1.0}, (), {"required": 2, "arg2": 3}),
+    ],
+)
+def test_bind_matches_build(
+    bind_args: tuple,
+    bind_kwargs: dict,
+    args: tuple,
+    kwargs: dict,
+):
+    builder = bind(command, *bind_args, **bind_kwargs)
+
+    expected = build_command_string(command, *bind_args, *args, **bind_kwargs, **kwargs)
+    assert builder(*args, verify=True, **kwargs) == expected
+
+
+def test_bind_override():
+    builder = bind(command, "hi", option2=5.0, required=1)
+
+    assert builder(option2=6.0) == 'test-command --option2 6.0 --required 1 "hi"'
+    assert builder(option2=None) == 'test-command --required 1 "hi"'
+
+
+@click.command()
+@click.option("--bias", "flavour", flag_value="bias", default=True)
+@click.option("--dark", "flavour", flag_value="dark")
+@click.option("--flat", "flavour", flag_value="flat")
+def expose(flavour: str):
+    return
+
+
+def test_bind_override_flag_value():
+    builder = bind(expose, dark=True)
+
+    assert builder() == "expose --dark"
+    assert builder(flat=True, verify=True) == "expose --flat"
+    assert builder(flavour="flat", verify=True) == "expose --flat"
+
+
+def test_bind_missing_required():
+    builder = bind(command, "hi")
+
+    with pytest.raises(ValueError) as err:
+        builder()
+
+    assert str(err.value) == "Parameter 'required' is required."
+
+
+def test_bind_invalid():
+    with pytest.raises(KeyError):
+        bind(command, bad_option=1)
+
+    with pytest.raises(TypeError):
+        bind(command, option2="bye")
+
+    with pytest.raises(ValueError) as err:
+        bind(command, "hi", 1)("bye", required=1)
+
+    assert str(err.value) == "More arguments provided than expected."
+
+
+def test_bind_verify_option_name():
+    @click.command()
+    @click.argument("VALUE", type=int)
+    @click.option("--verify", is_flag=True)
+    def flash(value: int, verify: bool):
+        return
+
+    builder = bind(flash, 1)
+    assert builder(verify=True) == "flash --verify 1"
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: test_cache.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+from __future__ import annotations
+
+import json
+import unittest.mock
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+
+from unclick import (
+    SchemaCache,
+    build_chain_string,
+    build_command_string,
+    command_to_json,
+    schema_cache,
+)
+
+
+def _make_command(name: str):
+    @click.command(name=name)
+    @click.argument("VALUE", type=int)
+    @click.option("--flag", is_flag=True)
+    def command(value: int, flag: bool):
+        return
+
+    return command
+
+
+def test_cache_get():
+    cache = SchemaCache()
+    command = _make_command("test")
+    command_json = command_to_json(command)
+
+    info_dict = cache.get(command_json)
+    assert info_dict["name"] == "test"
+    assert cache.get(command_json) is info_dict
+
+    # An equal string that is a different object must hit the same entry.
+    command_json_copy = "".join(command_json)
+    assert command_json_copy is not command_json
+    assert cache.get(command_json_copy) is info_dict
+
+    assert cache.get_parser(command_json) is cache.get_parser(command_json)
+    assert len(cache) == 1
+
+
+def test_cache_commands_not_cached():
+    cache = SchemaCache()
+    command = _make_command("test")
+
+    assert cache.get(command) == cache.get(command_to_json(command))
+    assert cache.get(command) is not cache.get(command)
+    assert len(cache) == 1
+
+
+def test_cache_dict_identity():
+    cache = SchemaCache()
+    command_json = command_to_json(_make_command("test"))
+
+    info_dict1 = json.loads(command_json)
+    info_dict2 = json.loads(command_json)
+
+    assert cache.get(info_dict1) is info_dict1
+    assert cache.get(info_dict2) is info_dict2
+    assert len(cache) == 2
+
+
+def test_cache_eviction():
+    cache = SchemaCache(maxsize=2)
+    commands = [command_to_json(_make_command(f"test{ii}")) for ii in range(3)]
+
+    for command in commands:
+        cache.get(command)
+
+    assert len(cache) == 2
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_cache_threads():
+    cache = SchemaCache(maxsize=5)
+    commands = [_make_command(f"test{ii}") for ii in range(10)]
+    command_jsons = [command_to_json(command) for command in commands]
+
+    def worker(ii: int):
+        command = command_jsons[ii % len(commands)]
+        assert cache.get(command)["name"] == commands[ii % len(commands)].name
+        cache.get_parser(command)
+        return ii
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(worker, range(2000))) == list(range(2000))
+
+    assert len(cache) <= 5
+
+
+def test_build_uses_cache():
+    command_json = command_to_json(_make_command("cached"))
+
+    schema_cache.clear()
+
+    assert build_command_string(command_json, 1, flag=True) == "cached --flag 1"
+    assert len(schema_cache) == 1
+
+
+def test_build_modified_command():
+    command = _make_command("modified")
+    assert build_command_string(command, 1) == "modified 1"
+
+    command.params.append(click.Option(["--speed"], type=int))
+    assert build_command_string(command, 1, speed=2) == "modified --speed 2 1"
+
+
+def test_build_chain_added_subcommand():
+    @click.group()
+    def group():
+        pass
+
+    @group.command()
+    def first():
+        pass
+
+    assert build_chain_string(group, [("first", (), {})]) == "group first"
+
+    @group.command()
+    def second():
+        pass
+
+    assert build_chain_string(group, [("second", (), {})]) == "group second"
+
+
+def test_cache_equal_strings_parsed_once():
+    cache = SchemaCache()
+    command_json = command_to_json(_make_command("test"))
+
+    with unittest.mock.patch("json.loads", wraps=json.loads) as mock_loads:
+        for _ in range(5):
+            cache.get("".join(command_json))
+
+    assert mock_loads.call_count == 1
+    assert len(cache) == 1
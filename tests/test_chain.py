@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: test_chain.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+from __future__ import annotations
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from unclick import (
+    build_batch_string,
+    build_chain_string,
+    command_to_json,
+    schema_cache,
+)
+from unclick.core import _verify_chain_string
+
+
+calls: list[tuple] = []
+
+
+@click.group(chain=True)
+@click.option("--verbose", is_flag=True)
+def sequencer(verbose: bool):
+    calls.append(("sequencer", verbose))
+
+
+@sequencer.command()
+@click.argument("POSITION", type=float)
+@click.argument("AXIS", type=str, required=False)
+@click.option("--speed", type=int, default=1)
+def move(position: float, axis: str | None, speed: int):
+    calls.append(("move", position, axis, speed))
+
+
+@sequencer.command()
+@click.option("--now", is_flag=True)
+def stop(now: bool):
+    calls.append(("stop", now))
+
+
+@sequencer.command()
+@click.argument("VALUES", type=int, nargs=-1)
+def many(values: tuple[int, ...]):
+    calls.append(("many", values))
+
+
+@click.group()
+def group():
+    pass
+
+
+@group.command()
+def status():
+    pass
+
+
+@click.group(name="group-arg")
+@click.argument("TARGET", required=False)
+def group_arg(target: str | None):
+    pass
+
+
+@group_arg.command(name="status")
+@click.option("--full", is_flag=True)
+def group_arg_status(full: bool):
+    pass
+
+
+@click.group()
+def outer():
+    pass
+
+
+@outer.group()
+def inner():
+    pass
+
+
+@inner.command(name="status")
+def inner_status():
+    pass
+
+
+def test_build_chain():
+    command_string = build_chain_string(
+        sequencer,
+        [("move", (1.5, "x"), {"speed": 2}), ("stop", (), {"now": True})],
+        verbose=True,
+        verify=True,
+    )
+    assert command_string == 'sequencer --verbose move --speed 2 1.5 "x" stop --now'
+
+    calls.clear()
+    result = CliRunner().invoke(sequencer, command_string.split(" ", 1)[1])
+    assert result.exit_code == 0
+    assert calls == [
+        ("sequencer", True),
+        ("move", 1.5, "x", 2),
+        ("stop", True),
+    ]
+
+
+def test_chain_variadic_argument():
+    runner = CliRunner()
+
+    # click assigns the name of the next subcommand to the variadic argument.
+    result = runner.invoke(sequencer, "many 1 2 stop --now")
+    assert result.exit_code != 0
+
+    with pytest.raises(ValueError) as err:
+        build_chain_string(sequencer, [("many", ([1, 2],), {}), ("stop", (), {})])
+
+    assert "takes a variable number of values" in str(err.value)
+
+    command_string = build_chain_string(
+        sequencer,
+        [("stop", (), {"now": True}), ("many", ([1, 2],), {})],
+        verify=True,
+    )
+    assert command_string == "sequencer stop --now many 1 2"
+
+    calls.clear()
+    result = runner.invoke(sequencer, command_string.split(" ", 1)[1])
+    assert result.exit_code == 0
+    assert calls == [("sequencer", False), ("stop", True), ("many", (1, 2))]
+
+
+def test_group_optional_argument():
+    runner = CliRunner()
+
+    # click assigns the name of the subcommand to the group argument.
+    result = runner.invoke(group_arg, "status")
+    assert result.exit_code != 0
+
+    with pytest.raises(ValueError) as err:
+        build_chain_string(group_arg, [("status", (), {})])
+
+    assert str(err.value) == (
+        "Argument 'target' for command 'group-arg' cannot be omitted in a chain."
+    )
+
+    command_string = build_chain_string(
+        group_arg,
+        [("status", (), {"full": True})],
+        "camera",
+        verify=True,
+    )
+    assert command_string == 'group-arg "camera" status --full'
+
+    result = runner.invoke(group_arg, command_string.split(" ", 1)[1])
+    assert result.exit_code == 0
+
+
+def test_verify_chain_mismatch():
+    info_dict = schema_cache.get(sequencer)
+    commands = [("stop", (), {}), ("stop", (), {"now": True})]
+
+    _verify_chain_string(info_dict, "sequencer stop stop --now", commands, (), {})
+
+    with pytest.raises(ValueError) as err:
+        _verify_chain_string(info_dict, "sequencer stop stop", commands, (), {})
+
+    assert "Value for parameter 'now'" in str(err.value)
+
+    with pytest.raises(ValueError) as err:
+        _verify_chain_string(info_dict, "sequencer stop", commands, (), {})
+
+    assert str(err.value) == (
+        "Expected command 'stop' in command string 'sequencer stop', found None."
+    )
+
+
+def test_build_chain_json():
+    command_json = command_to_json(sequencer)
+    command_string = build_chain_string(command_json, [("stop", (), {})])
+
+    assert command_string == "sequencer stop"
+
+
+def test_chain_omitted_argument():
+    with pytest.raises(ValueError) as err:
+        build_chain_string(sequencer, [("move", (1,), {}), ("stop", (), {})])
+
+    assert "cannot be omitted in a chain" in str(err.value)
+
+    command_string = build_chain_string(sequencer, [("move", (1,), {})])
+    assert command_string == "sequencer move 1"
+
+
+def test_chain_not_allowed():
+    with pytest.raises(ValueError) as err:
+        build_chain_string(group, [("status", (), {}), ("status", (), {})])
+
+    assert str(err.value) == "Group 'group' does not allow chaining."
+
+    assert build_chain_string(group, [("status", (), {})]) == "group status"
+
+
+def test_chain_invalid_command():
+    with pytest.raises(ValueError) as err:
+        build_chain_string(sequencer, [("jump", (), {})])
+
+    assert str(err.value) == "Command 'jump' not found."
+
+    with pytest.raises(ValueError) as err:
+        build_chain_string(move, [("stop", (), {})])
+
+    assert str(err.value) == "Command 'move' is not a group."
+
+
+def test_chain_nested_group():
+    with pytest.raises(ValueError) as err:
+        build_chain_string(outer, [("inner", (), {})])
+
+    assert str(err.value) == (
+        "Command 'inner' is a group. Nested groups are not supported."
+    )
+
+
+def test_build_batch():
+    batch = build_batch_string(
+        [(move, (1,), {}), (stop, (), {"now": True})],
+        delimiter="; ",
+        verify=True,
+    )
+    assert batch == "move 1; stop --now"
+
+
+def test_build_batch_delimiter_in_command():
+    with pytest.raises(ValueError) as err:
+        build_batch_string([(move, (1, "a;b"), {})], delimiter=";")
+
+    assert "contains the delimiter" in str(err.value)
+
+
+def test_build_batch_empty_delimiter():
+    with pytest.raises(ValueError) as err:
+        build_batch_string([(stop, (), {})], delimiter="")
+
+    assert str(err.value) == "The delimiter cannot be an empty string."
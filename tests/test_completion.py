@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: test_completion.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+from __future__ import annotations
+
+import click
+import pytest
+
+from unclick import CommandIndex, command_to_json
+
+
+@click.group()
+def camera():
+    pass
+
+
+@camera.command()
+@click.argument("FLAVOUR", type=click.Choice(["bias", "dark", "flat", "object"]))
+@click.argument("EXPTIME", type=float, required=False)
+@click.option("--count", "-c", type=int, default=1)
+@click.option("--binning", type=click.Choice(["1x1", "2x2", "4x4"]))
+@click.option("--verbose/--quiet", default=False)
+def expose(**kwargs):
+    pass
+
+
+@camera.command()
+def status():
+    pass
+
+
+@camera.command()
+def stop():
+    pass
+
+
+@click.command()
+@click.option("--now", is_flag=True)
+def shutdown(now: bool):
+    pass
+
+
+@click.group(chain=True)
+@click.option("--verbose", is_flag=True)
+@click.option("--mode", type=click.Choice(["fast", "slow"]))
+def seq(verbose: bool, mode: str | None):
+    pass
+
+
+@seq.command()
+@click.argument("AXIS", type=click.Choice(["x", "y"]))
+@click.option("--speed", type=int)
+def move(axis: str, speed: int | None):
+    pass
+
+
+@seq.command(name="stop")
+def seq_stop():
+    pass
+
+
+@pytest.fixture()
+def index():
+    yield CommandIndex([camera, command_to_json(shutdown)])
+
+
+@pytest.fixture()
+def seq_index():
+    yield CommandIndex([seq])
+
+
+def test_index_commands(index: CommandIndex):
+    assert len(index) == 5
+
+    assert index.find_commands() == [
+        "camera",
+        "camera expose",
+        "camera status",
+        "camera stop",
+        "shutdown",
+    ]
+    assert index.find_commands("camera st") == ["camera status", "camera stop"]
+    assert index.find_commands("focus") == []
+
+
+@pytest.mark.parametrize(
+    "line,completions",
+    [
+        ("", ["camera", "shutdown"]),
+        ("ca", ["camera"]),
+        ("camera", ["camera"]),
+        ("camera ", ["expose", "status", "stop"]),
+        ("camera st", ["status", "stop"]),
+        ("camera expose ", ["bias", "dark", "flat", "object"]),
+        ("camera expose d", ["dark"]),
+        (
+            "camera expose --",
+            ["--binning", "--count", "--help", "--quiet", "--verbose"],
+        ),
+        ("camera expose --count 2 --", ["--binning", "--help", "--quiet", "--verbose"]),
+        ("camera expose --binning ", ["1x1", "2x2", "4x4"]),
+        ("camera expose --binning 2", ["2x2"]),
+        ("camera expose --count ", []),
+        ("camera expose flat ", []),
+        ("shutdown --n", ["--now"]),
+        ("focus ", []),
+    ],
+)
+def test_complete(index: CommandIndex, line: str, completions: list[str]):
+    assert index.complete(line) == completions
+
+
+@pytest.mark.parametrize(
+    "line,completions",
+    [
+        ("seq ", ["move", "stop"]),
+        ("seq --verbose m", ["move"]),
+        ("seq --mode fast --verbose ", ["move", "stop"]),
+        ("seq --mode ", ["fast", "slow"]),
+        ("seq --verbose move --", ["--help", "--speed"]),
+        ("seq move ", ["x", "y"]),
+        ("seq move --speed 2 ", ["x", "y"]),
+        ("seq move x ", ["move", "stop"]),
+        ("seq move x s", ["stop"]),
+        ("seq move x stop ", ["move", "stop"]),
+        ("seq move x stop move y --", ["--help", "--speed"]),
+        ("seq bogus ", []),
+        ("seq move x bogus ", []),
+    ],
+)
+def test_complete_chain(seq_index: CommandIndex, line: str, completions: list[str]):
+    assert seq_index.complete(line) == completions
+
+
+def test_complete_unclosed_quote(index: CommandIndex):
+    assert index.complete('camera expose "da') == ["dark"]
+
+
+def test_unset_params(index: CommandIndex):
+    assert index.unset_params("camera expose") == [
+        "flavour",
+        "exptime",
+        "count",
+        "binning",
+        "verbose",
+    ]
+
+    assert index.unset_params("camera expose -c 3 --quiet bias") == [
+        "exptime",
+        "binning",
+    ]
+
+
+def test_unset_params_chain(seq_index: CommandIndex):
+    assert seq_index.unset_params("seq --verbose") == ["mode"]
+    assert seq_index.unset_params("seq move --sp") == ["axis", "speed"]
+    assert seq_index.unset_params("seq --verbose move --speed 2 x") == []
+    assert seq_index.unset_params("seq move x stop") == []
+
+
+def test_unset_params_no_command(index: CommandIndex):
+    with pytest.raises(ValueError):
+        index.unset_params("focus --position 1")
+
+
+def test_add_subcommands_only():
+    index = CommandIndex()
+    index.add(camera, name="")
+
+    assert index.find_commands() == ["expose", "status", "stop"]
+
+
+def test_add_after_complete(index: CommandIndex):
+    assert index.complete("s") == ["shutdown"]
+
+    index.add(seq)
+
+    assert index.complete("s") == ["seq", "shutdown"]
+    assert index.find_commands("seq m") == ["seq move"]
@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: test_logs.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+from __future__ import annotations
+
+import json
+import pathlib
+
+import click
+import pytest
+
+from unclick import (
+    build_chain_string,
+    build_command_string,
+    command_to_json,
+    parse_log,
+    schema_cache,
+    write_jsonl,
+    write_parquet,
+)
+
+
+@click.group()
+def camera():
+    pass
+
+
+@camera.command()
+@click.argument("EXPTIME", type=float)
+@click.option("--flavour", type=click.Choice(["bias", "dark", "object"]))
+@click.option("--count", "-c", type=int, default=1)
+def expose(**kwargs):
+    pass
+
+
+@click.command()
+@click.option("--now", is_flag=True)
+def shutdown(now: bool):
+    pass
+
+
+@click.group(chain=True)
+@click.option("--verbose", is_flag=True)
+def seq(verbose: bool):
+    pass
+
+
+@seq.command()
+@click.argument("POSITION", type=int)
+@click.option("--speed", type=int)
+def move(position: int, speed: int | None):
+    pass
+
+
+@seq.command()
+def stop():
+    pass
+
+
+LINES = [
+    "2026-01-01 00:00:01 INFO camera expose --flavour object 15.0",
+    "2026-01-01 00:00:02 DEBUG Some other message.",
+    "",
+    "2026-01-01 00:00:03 INFO camera expose -c 3 1",
+    "2026-01-01 00:00:04 INFO shutdown --now",
+    "2026-01-01 00:00:05 INFO camera expose --bad 1",
+    "2026-01-01 00:00:06 INFO focus 100",
+]
+
+PATTERN = r"INFO (?P<command>.+)$"
+
+
+@pytest.fixture()
+def log_file(tmp_path: pathlib.Path):
+    path = tmp_path / "commands.log"
+    path.write_text("\n".join(LINES) + "\n")
+
+    yield path
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+@pytest.mark.parametrize("chunk_size", [10, 2**20])
+def test_parse_log(log_file: pathlib.Path, workers: int, chunk_size: int):
+    records = list(
+        parse_log(
+            log_file,
+            [camera, shutdown],
+            pattern=PATTERN,
+            workers=workers,
+            chunk_size=chunk_size,
+        )
+    )
+
+    assert len(records) == 5
+
+    assert records[0]["offset"] == 0
+    assert records[0]["command"] == "camera expose"
+    assert records[0]["args"] == [15.0]
+    assert records[0]["kwargs"] == {"flavour": "object"}
+    assert records[0]["error"] is None
+
+    assert records[1]["args"] == [1.0]
+    assert records[1]["kwargs"] == {"count": 3}
+
+    assert records[0]["groups"] == {"camera": {}}
+
+    assert records[2]["command"] == "shutdown"
+    assert records[2]["kwargs"] == {"now": True}
+    assert records[2]["groups"] == {}
+
+    assert records[3]["command"] is None
+    assert "No such option: --bad" in records[3]["error"]
+
+    assert records[4]["error"] == "Unknown command."
+
+    with open(log_file, "rb") as file:
+        file.seek(records[4]["offset"])
+        assert file.readline().decode().strip() == LINES[-1]
+
+
+def test_parse_log_no_pattern(tmp_path: pathlib.Path):
+    path = tmp_path / "commands.log"
+    path.write_text(build_command_string(shutdown, now=True) + "\n")
+
+    records = list(parse_log(path, [shutdown], workers=0))
+    assert records[0]["command"] == "shutdown"
+
+
+def test_parse_log_empty(tmp_path: pathlib.Path):
+    path = tmp_path / "empty.log"
+    path.write_text("")
+
+    assert list(parse_log(path, [camera], workers=0)) == []
+
+
+def test_parse_log_many_commands(tmp_path: pathlib.Path):
+    commands = []
+    for ii in range(10):
+
+        @click.command(name=f"cmd{ii}")
+        @click.argument("VALUE", type=int)
+        def command(value: int):
+            pass
+
+        commands.append(command_to_json(command))
+
+    path = tmp_path / "commands.log"
+    path.write_text("".join(f"cmd{ii % 10} {ii}\n" for ii in range(100)))
+
+    schema_cache.clear()
+
+    records = list(parse_log(path, commands, workers=0))
+    assert [record["args"] for record in records] == [[ii] for ii in range(100)]
+
+    # The shared cache is not used to parse the log.
+    assert len(schema_cache) == 0
+
+
+def test_parse_log_groups(tmp_path: pathlib.Path):
+    lines = [
+        build_chain_string(seq, [("move", (2,), {})], verbose=True),
+        build_chain_string(seq, [("move", (1,), {"speed": 5}), ("stop", (), {})]),
+        "seq",
+        "seq move 1 park",
+        "camera shutter",
+    ]
+
+    path = tmp_path / "commands.log"
+    path.write_text("\n".join(lines) + "\n")
+
+    records = list(parse_log(path, [seq, camera], workers=0))
+    assert len(records) == 6
+
+    assert records[0]["command"] == "seq move"
+    assert records[0]["args"] == [2]
+    assert records[0]["groups"] == {"seq": {"verbose": True}}
+
+    assert records[1]["command"] == "seq move"
+    assert records[1]["kwargs"] == {"speed": 5}
+    assert records[1]["groups"] == {"seq": {}}
+    assert records[2]["command"] == "seq stop"
+    assert records[2]["offset"] == records[1]["offset"]
+
+    assert records[3]["error"] == "Missing command for group 'seq'."
+    assert records[4]["error"] == "No such command 'park' in group 'seq'."
+    assert records[5]["error"] == "No such command 'shutter' in group 'camera'."
+
+
+def test_parse_log_extra_arguments(tmp_path: pathlib.Path):
+    path = tmp_path / "commands.log"
+    path.write_text("shutdown --now 1\n")
+
+    records = list(parse_log(path, [shutdown], workers=0))
+    assert records[0]["error"] == "Unexpected extra arguments ['1']."
+
+
+def test_parse_log_pattern_no_command_group(log_file: pathlib.Path):
+    with pytest.raises(ValueError, match="named group 'command'"):
+        parse_log(log_file, [camera], pattern=r"INFO (.+)$")
+
+
+@pytest.mark.parametrize("chunk_size", [0, -1])
+def test_parse_log_bad_chunk_size(log_file: pathlib.Path, chunk_size: int):
+    with pytest.raises(ValueError, match="chunk_size"):
+        parse_log(log_file, [camera], chunk_size=chunk_size)
+
+
+def test_write_jsonl(log_file: pathlib.Path, tmp_path: pathlib.Path):
+    records = parse_log(log_file, [camera, shutdown], pattern=PATTERN, workers=0)
+
+    path = tmp_path / "records.jsonl"
+    assert write_jsonl(records, path) == 5
+
+    lines = path.read_text().splitlines()
+    assert json.loads(lines[0])["kwargs"] == {"flavour": "object"}
+
+
+def test_write_parquet(log_file: pathlib.Path, tmp_path: pathlib.Path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+
+    records = parse_log(log_file, [camera, shutdown], pattern=PATTERN, workers=0)
+
+    path = tmp_path / "records.parquet"
+    assert write_parquet(records, path, batch_size=2) == 5
+
+    table = parquet.read_table(path)
+    assert table.num_rows == 5
+    assert json.loads(table.column("kwargs")[1].as_py()) == {"count": 3}
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: test_static.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+from __future__ import annotations
+
+import importlib.util
+import pathlib
+
+import pytest
+
+from unclick import command_to_json, source_to_json
+
+
+SOURCE = '''
+import click
+from click import option as opt
+
+EXPTIME = 15.0
+FLAVOURS = ["bias", "dark", "flat"]
+
+
+@click.group()
+def camera():
+    """Commands for the camera."""
+
+
+@camera.command()
+@click.argument("EXPTIME", type=float, default=EXPTIME, required=False)
+@opt("--flavour", type=click.Choice(FLAVOURS), default="dark")
+@click.option("--count", "-c", type=click.IntRange(1, 10), default=1)
+@click.option("--window", type=(int, int), default=(-1, -1))
+@click.option("--verbose/--quiet", default=True, help="Be verbose.")
+@click.pass_obj
+def expose(obj, exptime, flavour, count, window, verbose):
+    """Exposes the camera.
+
+    Takes an exposure of a certain type.
+
+    """
+
+
+@actor_parser.command(name="set-temperature")
+@click.argument("TEMPERATURE", type=int)
+def set_temperature_cmd(temperature):
+    pass
+
+
+def not_a_command():
+    pass
+'''
+
+
+def _import(path: pathlib.Path):
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    assert spec and spec.loader
+
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+@pytest.fixture()
+def source_file(tmp_path: pathlib.Path):
+    path = tmp_path / "actor_commands.py"
+    path.write_text(SOURCE)
+
+    yield path
+
+
+def test_source_to_json(source_file: pathlib.Path):
+    command_jsons = source_to_json(source_file, fallback=False)
+
+    assert list(command_jsons) == ["camera", "set-temperature"]
+
+    # Define the missing parent group and import the module to compare.
+    source_file.write_text("import click\nactor_parser = click.Group()\n" + SOURCE)
+    module = _import(source_file)
+
+    assert command_jsons["camera"] == command_to_json(module.camera)
+    assert command_jsons["set-temperature"] == command_to_json(
+        module.set_temperature_cmd
+    )
+
+
+def test_source_to_json_does_not_import(source_file: pathlib.Path):
+    source_file.write_text("raise RuntimeError('hardware not found')\n" + SOURCE)
+
+    command_jsons = source_to_json(source_file, fallback=False)
+    assert "camera" in command_jsons
+
+
+def test_source_to_json_fallback(tmp_path: pathlib.Path):
+    path = tmp_path / "dynamic_commands.py"
+    path.write_text(
+        """
+import click
+
+
+def get_default():
+    return 5
+
+
+@click.command()
+@click.option("--value", type=int, default=get_default())
+def dynamic(value):
+    pass
+
+
+@click.command()
+def static():
+    pass
+"""
+    )
+
+    with pytest.raises(ValueError) as err:
+        source_to_json(path, fallback=False)
+
+    assert str(err.value) == (
+        "Cannot parse command 'dynamic' statically: cannot evaluate get_default()."
+    )
+
+    command_jsons = source_to_json(path)
+    module = _import(path)
+
+    assert command_jsons["dynamic"] == command_to_json(module.dynamic)
+    assert command_jsons["static"] == command_to_json(module.static)
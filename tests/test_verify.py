@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: test_verify.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+from __future__ import annotations
+
+import click
+import pytest
+
+from unclick import (
+    build_command_string,
+    command_to_json,
+    parse_command_string,
+    verify_command_string,
+)
+
+
+@click.command(name="test-command")
+@click.argument("ARG1", type=str)
+@click.argument("ARG2", type=int, required=False)
+@click.option("--flag1", "-f", is_flag=True)
+@click.option("--option2", "-o", type=float, default=3.0)
+@click.option("--shout3/--no-shout3", " /-S", default=True)
+@click.option("--tuple-option", type=click.Tuple([str, int]))
+@click.option("--dark", "flavour", flag_value="dark", default=False)
+@click.option("--flat", "flavour", flag_value="flat", default=False)
+def command(*args, **kwrgs):
+    return
+
+
+@pytest.mark.parametrize(
+    "args,kwargs",
+    [
+        (("hi",), {}),
+        (("hi how are you", 2), {"flag1": True}),
+        (("hi",), {"option2": 5, "shout3": False}),
+        (("hi",), {"tuple_option": ("bye", 3)}),
+        (("hi",), {"flat": True}),
+        (("hi",), {"flavour": "dark"}),
+    ],
+)
+def test_verify(args: tuple, kwargs: dict):
+    command_string = build_command_string(command, *args, verify=True, **kwargs)
+    verify_command_string(command, command_string, *args, **kwargs)
+
+
+def test_parse_command_string():
+    command_json = command_to_json(command)
+    values = parse_command_string(command_json, 'test-command -f -S "hi" 2')
+
+    assert values["arg1"] == "hi"
+    assert values["arg2"] == 2
+    assert values["flag1"] is True
+    assert values["option2"] == 3.0
+    assert values["shout3"] is False
+    assert values["flavour"] is False
+
+
+def test_verify_mismatch():
+    with pytest.raises(ValueError) as err:
+        verify_command_string(command, 'test-command "bye"', "hi")
+
+    assert str(err.value) == (
+        "Value for parameter 'arg1' in command string 'test-command \"bye\"' "
+        "is 'bye', expected 'hi'."
+    )
+
+
+def test_verify_fails_tuple_with_spaces():
+    with pytest.raises(ValueError):
+        build_command_string(command, "hi", tuple_option=("a b", 1), verify=True)
+
+
+def test_parse_bad_command_name():
+    with pytest.raises(ValueError) as err:
+        parse_command_string(command, 'other-command "hi"')
+
+    assert str(err.value) == "Command string does not start with 'test-command'."
+
+
+def test_parse_unknown_option():
+    with pytest.raises(ValueError) as err:
+        parse_command_string(command, 'test-command --bad "hi"')
+
+    assert "No such option: --bad" in str(err.value)
+
+
+def test_parser_cache_dict():
+    command_info = {
+        "name": "cmd",
+        "params": [
+            {
+                "name": "value",
+                "param_type_name": "option",
+                "opts": ["--value"],
+                "secondary_opts": [],
+                "type": {"param_type": "Int"},
+                "required": False,
+                "nargs": 1,
+                "default": None,
+                "is_flag": False,
+            }
+        ],
+    }
+
+    assert parse_command_string(command_info, "cmd --value 1") == {"value": 1}
+    assert parse_command_string(command_info, "cmd") == {"value": None}
+
+
+@click.command()
+@click.option("--verify", is_flag=True)
+def flash(verify: bool):
+    return
+
+
+def test_verify_option_name():
+    assert build_command_string(flash, verify=True) == "flash --verify"
+    assert build_command_string(flash) == "flash"
+
+    verify_command_string(flash, "flash --verify", verify=True)